@@ -1,102 +1,247 @@
 import asyncio
 import logging
-from typing import Optional
+from collections import deque
+from functools import lru_cache
+from typing import Awaitable, Optional
 
 from browser_use import Browser as BrowserUseBrowser
 from browser_use import BrowserConfig
+from browser_use.browser.browser import ProxySettings
+from browser_use.browser.context import BrowserContext
 
 from app.config import config
 
 logger = logging.getLogger(__name__)
 
+_BROWSER_ATTRS = (
+    "headless",
+    "disable_security",
+    "extra_chromium_args",
+    "chrome_instance_path",
+    "wss_url",
+    "cdp_url",
+)
+
+
+def _get_browser_config() -> BrowserConfig:
+    """
+    Get the browser configuration from the app config.
+
+    The result is cached per browser settings object, so repeated pool
+    constructions reuse the same BrowserConfig.
+    """
+    return _build_browser_config(id(config.browser_config))
+
+
+@lru_cache(maxsize=1)
+def _build_browser_config(_settings_id: int) -> BrowserConfig:
+    browser_config_kwargs = {"headless": False, "disable_security": True}
+
+    browser_settings = config.browser_config
+    if browser_settings:
+        # handle proxy settings.
+        proxy = browser_settings.proxy
+        if proxy and proxy.server:
+            browser_config_kwargs["proxy"] = ProxySettings(
+                server=proxy.server,
+                username=proxy.username,
+                password=proxy.password,
+            )
+
+        browser_config_kwargs.update(
+            {
+                attr: value
+                for attr in _BROWSER_ATTRS
+                if (value := getattr(browser_settings, attr, None)) is not None
+                and (not isinstance(value, list) or value)
+            }
+        )
+
+    return BrowserConfig(**browser_config_kwargs)
+
 
 class BrowserPool:
     """
-    A class to manage a pool of browser instances.
+    A class to manage a pool of browser contexts.
+
+    A single browser instance is shared by the pool; each slot is a lightweight
+    browser context on top of it, which is far cheaper to create than a browser.
     """
 
     def __init__(self, max_size: int = 5):
         self.max_size = max_size
-        self._pool: asyncio.Queue[BrowserUseBrowser] = asyncio.Queue(maxsize=max_size)
-        self._lock = asyncio.Lock()
-        self._browser_config = self._get_browser_config()
-        self._initialized = False
+        self._browser: Optional[BrowserUseBrowser] = None
+        # Idle contexts; the semaphore counts free slots, and a free slot whose
+        # context was dropped is refilled with a new context on acquire.
+        self._idle: deque[BrowserContext] = deque()
+        self._sem = asyncio.Semaphore(max_size)
+        # Borrowed contexts mapped to the pool generation they were taken from;
+        # close() starts a new generation so stale contexts are never requeued.
+        self._leased: dict[BrowserContext, int] = {}
+        self._generation = 0
+        self._browser_config = _get_browser_config()
+        self._ready = asyncio.Event()
+        self._warmup: Optional[asyncio.Task] = None
 
     async def initialize(self):
         """
-        Initialize the browser pool by creating the initial browser instances.
+        Initialize the browser pool by creating the browser and its initial contexts.
+
+        Concurrent callers share a single warm-up; a failed warm-up is retried
+        on the next call.
         """
-        if self._initialized:
+        if self._ready.is_set():
             return
 
-        logger.info(f"Initializing browser pool with {self.max_size} browsers...")
-        for _ in range(self.max_size):
-            browser = await self._create_browser()
-            await self._pool.put(browser)
-        self._initialized = True
-        logger.info("Browser pool initialized.")
+        if self._warmup is None or self._warmup.done():
+            self._warmup = asyncio.create_task(self._warm_up())
+        await asyncio.shield(self._warmup)
 
-    async def acquire(self) -> BrowserUseBrowser:
+    async def _warm_up(self):
         """
-        Acquire a browser instance from the pool.
+        Create the shared browser and warm the pool's contexts.
         """
-        await self.initialize()
-        logger.debug("Acquiring browser from pool...")
-        browser = await self._pool.get()
-        logger.debug("Browser acquired from pool.")
-        return browser
+        logger.info(f"Initializing browser pool with {self.max_size} contexts...")
+        self._browser = await self._create_browser()
+        try:
+            results = await asyncio.gather(
+                *(self._browser.new_context() for _ in range(self.max_size)),
+                return_exceptions=True,
+            )
+        except BaseException:
+            await self._close_browser()
+            raise
 
-    async def release(self, browser: BrowserUseBrowser):
-        """
-        Release a browser instance back to the pool.
-        """
-        logger.debug("Releasing browser back to pool...")
-        await self._pool.put(browser)
-        logger.debug("Browser released back to pool.")
+        contexts = [r for r in results if not isinstance(r, BaseException)]
+        errors = [r for r in results if isinstance(r, BaseException)]
+        for error in errors:
+            logger.warning(f"Failed to create browser context: {error}")
+        if not contexts:
+            await self._close_browser()
+            raise errors[0]
 
-    async def close(self):
+        # Slots whose context failed are filled on demand by _take().
+        self._idle.extend(contexts)
+        self._ready.set()
+        logger.info(
+            f"Browser pool initialized with {len(contexts)}/{self.max_size} contexts."
+        )
+
+    def acquire(self) -> Awaitable[BrowserContext]:
         """
-        Close all browser instances in the pool.
+        Acquire a browser context from the pool.
+
+        Once the pool is warm this skips the initialize() call entirely;
+        callers still ``await browser_pool.acquire()`` either way.
         """
-        logger.info("Closing all browsers in the pool...")
-        while not self._pool.empty():
-            browser = await self._pool.get()
-            await browser.close()
-        logger.info("All browsers closed.")
+        if self._ready.is_set():
+            return self._take()
+        return self._slow_acquire()
+
+    async def _slow_acquire(self) -> BrowserContext:
+        await self.initialize()
+        return await self._take()
+
+    async def _take(self) -> BrowserContext:
+        while True:
+            generation, sem = self._generation, self._sem
+            await sem.acquire()
+            if generation == self._generation:
+                break
+            # close() ran while we waited; pass the wake-up on to the next
+            # waiter on the old semaphore and retry against the new pool.
+            sem.release()
+            await self.initialize()
 
-    def _get_browser_config(self) -> BrowserConfig:
+        try:
+            if self._idle:
+                context = self._idle.popleft()
+            else:
+                context = await self._browser.new_context()
+        except BaseException:
+            sem.release()
+            raise
+        self._leased[context] = generation
+        return context
+
+    async def release(self, context: BrowserContext):
         """
-        Get the browser configuration from the app config.
+        Release a browser context back to the pool.
+
+        Cookies and permissions are cleared first so the next borrower starts
+        from a clean state. A context that fails to reset is closed and dropped;
+        its slot is refilled with a new context on a later acquire. Contexts
+        borrowed before close() are closed instead of being requeued. Releasing a
+        context that is not on loan, such as a second release, is ignored.
         """
-        browser_config_kwargs = {"headless": False, "disable_security": True}
+        if context not in self._leased:
+            logger.warning("Ignoring release of a browser context that is not on loan")
+            return
 
-        if config.browser_config:
-            from browser_use.browser.browser import ProxySettings
+        generation, sem = self._leased.pop(context), self._sem
+        if generation != self._generation:
+            await self._discard(context)
+            return
 
-            # handle proxy settings.
-            if config.browser_config.proxy and config.browser_config.proxy.server:
-                browser_config_kwargs["proxy"] = ProxySettings(
-                    server=config.browser_config.proxy.server,
-                    username=config.browser_config.proxy.username,
-                    password=config.browser_config.proxy.password,
-                )
+        try:
+            session = context.session
+            if session is not None:
+                await session.context.clear_cookies()
+                await session.context.clear_permissions()
+        except Exception as e:
+            logger.warning(f"Dropping browser context that failed to reset: {e}")
+            await self._discard(context)
+        else:
+            # close() may have run while the context was being reset
+            if generation == self._generation:
+                self._idle.append(context)
+            else:
+                await self._discard(context)
+        finally:
+            sem.release()
 
-            browser_attrs = [
-                "headless",
-                "disable_security",
-                "extra_chromium_args",
-                "chrome_instance_path",
-                "wss_url",
-                "cdp_url",
-            ]
+    def borrow(self) -> "_ContextBorrow":
+        """
+        Borrow a browser context for the duration of an ``async with`` block.
 
-            for attr in browser_attrs:
-                value = getattr(config.browser_config, attr, None)
-                if value is not None:
-                    if not isinstance(value, list) or value:
-                        browser_config_kwargs[attr] = value
+        The context is always returned to the pool, even if the block raises.
+        """
+        return _ContextBorrow(self)
 
-        return BrowserConfig(**browser_config_kwargs)
+    async def close(self):
+        """
+        Close all browser contexts in the pool, then the shared browser.
+        """
+        logger.info("Closing all browser contexts in the pool...")
+        idle, self._idle = self._idle, deque()
+        old_sem, self._sem = self._sem, asyncio.Semaphore(self.max_size)
+        self._generation += 1
+        # Wake acquirers blocked on the old semaphore so they retry on the new one
+        for _ in range(self.max_size):
+            old_sem.release()
+        for context in idle:
+            await self._discard(context)
+        await self._close_browser()
+        self._ready.clear()
+        self._warmup = None
+        logger.info("Browser pool closed.")
+
+    async def _close_browser(self):
+        """
+        Close the shared browser, if one was created.
+        """
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            await browser.close()
+
+    async def _discard(self, context: BrowserContext):
+        """
+        Close a browser context, logging rather than raising on failure.
+        """
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser context: {e}")
 
     async def _create_browser(self) -> BrowserUseBrowser:
         """
@@ -108,5 +253,25 @@ class BrowserPool:
         return browser
 
 
+class _ContextBorrow:
+    """
+    Async context manager that acquires a browser context on enter and releases it on exit.
+    """
+
+    __slots__ = ("pool", "context")
+
+    def __init__(self, pool: BrowserPool):
+        self.pool = pool
+        self.context: Optional[BrowserContext] = None
+
+    async def __aenter__(self) -> BrowserContext:
+        self.context = await self.pool.acquire()
+        return self.context
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.pool.release(self.context)
+        self.context = None
+
+
 # Global browser pool instance
 browser_pool = BrowserPool(max_size=5)  # You can adjust the pool size as needed
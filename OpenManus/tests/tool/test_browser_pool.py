@@ -0,0 +1,183 @@
+import asyncio
+from typing import AsyncGenerator, List, Optional
+
+import pytest
+import pytest_asyncio
+
+from app.tool.browser_pool import BrowserPool
+
+
+class FakeSession:
+    """Stands in for the Playwright context behind a browser_use session."""
+
+    def __init__(self, fail_reset: bool = False):
+        self.context = self
+        self.fail_reset = fail_reset
+        self.cleared = 0
+        # When set, resetting blocks until the event fires
+        self.gate: Optional[asyncio.Event] = None
+
+    async def clear_cookies(self):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail_reset:
+            raise RuntimeError("context crashed")
+        self.cleared += 1
+
+    async def clear_permissions(self):
+        pass
+
+
+class FakeContext:
+    """Minimal browser context with a session and a close() method."""
+
+    def __init__(self):
+        self.session = FakeSession()
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    """Browser stub that records every context it creates."""
+
+    def __init__(self):
+        self.contexts: List[FakeContext] = []
+        self.closed = False
+
+    async def new_context(self) -> FakeContext:
+        # Yield so concurrent callers can interleave with the warm-up
+        await asyncio.sleep(0)
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest_asyncio.fixture(scope="function")
+async def pool() -> AsyncGenerator[BrowserPool, None]:
+    """Creates a small pool whose browsers are FakeBrowser instances."""
+    pool = BrowserPool(max_size=2)
+    pool.browsers = []
+
+    async def create_browser():
+        browser = FakeBrowser()
+        pool.browsers.append(browser)
+        return browser
+
+    pool._create_browser = create_browser
+    try:
+        yield pool
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_acquire_warms_once(pool):
+    """Tests that concurrent first acquires share a single warm-up."""
+    first, second = await asyncio.gather(pool.acquire(), pool.acquire())
+
+    assert len(pool.browsers) == 1
+    assert len(pool.browsers[0].contexts) == pool.max_size
+    assert first is not second
+
+    await pool.release(first)
+    await pool.release(second)
+
+
+@pytest.mark.asyncio
+async def test_borrow_releases_when_block_raises(pool):
+    """Tests that borrow() returns the context even if the block raises."""
+    with pytest.raises(ValueError):
+        async with pool.borrow() as context:
+            raise ValueError("task failed")
+
+    assert context in pool._idle
+    assert context.session.cleared == 1
+    assert pool._sem._value == pool.max_size
+
+
+@pytest.mark.asyncio
+async def test_release_after_reset_failure(pool):
+    """Tests that a context failing to reset is dropped without losing its slot."""
+    contexts = [await pool.acquire() for _ in range(pool.max_size)]
+    for context in contexts:
+        context.session.fail_reset = True
+        await pool.release(context)
+
+    assert all(context.closed for context in contexts)
+    assert pool._sem._value == pool.max_size
+
+    # The freed slots are refilled with fresh contexts
+    context = await asyncio.wait_for(pool.acquire(), timeout=1)
+    assert context not in contexts
+    await pool.release(context)
+
+
+@pytest.mark.asyncio
+async def test_close_then_reinitialize(pool):
+    """Tests that closing and re-initializing does not reuse stale contexts."""
+    borrowed = await pool.acquire()
+    await pool.close()
+    assert pool.browsers[0].closed
+
+    # A context borrowed before close() is closed rather than requeued
+    await pool.release(borrowed)
+    assert borrowed.closed
+    assert borrowed not in pool._idle
+
+    context = await pool.acquire()
+    assert len(pool.browsers) == 2
+    assert context in pool.browsers[1].contexts
+    assert pool._sem._value == pool.max_size - 1
+    await pool.release(context)
+
+
+@pytest.mark.asyncio
+async def test_release_during_close(pool):
+    """Tests that a context whose reset straddles close() is not requeued."""
+    context = await pool.acquire()
+    context.session.gate = asyncio.Event()
+    release = asyncio.create_task(pool.release(context))
+    await asyncio.sleep(0)
+
+    await pool.close()
+    context.session.gate.set()
+    await release
+
+    assert context.closed
+    assert context not in pool._idle
+    assert pool._sem._value == pool.max_size
+
+
+@pytest.mark.asyncio
+async def test_acquire_during_close(pool):
+    """Tests that an acquire waiting when close() runs gets a new context."""
+    contexts = [await pool.acquire() for _ in range(pool.max_size)]
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+
+    await pool.close()
+    for context in contexts:
+        await pool.release(context)
+
+    context = await asyncio.wait_for(waiter, timeout=1)
+    assert context not in contexts
+    assert context in pool.browsers[1].contexts
+    await pool.release(context)
+    assert pool._sem._value == pool.max_size
+
+
+@pytest.mark.asyncio
+async def test_double_release_is_ignored(pool):
+    """Tests that releasing a context twice leaves the idle context usable."""
+    context = await pool.acquire()
+    await pool.release(context)
+    await pool.release(context)
+
+    assert not context.closed
+    assert list(pool._idle).count(context) == 1
+    assert pool._sem._value == pool.max_size
@@ -6,34 +6,47 @@ This script checks if your OpenManus installation is correctly set up
 by verifying dependencies, configurations, and basic functionality.
 """
 
+import io
 import os
 import sys
-import importlib.util
-import subprocess
-import json
-from pathlib import Path
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+
+# Placeholder values that mean the API key was never filled in
+_BAD_KEYS = frozenset({"YOUR_API_KEY", ""})
+
+_BAR = "=" * 80
+_HEADER_TMPL = f"\n{_BAR}\n {{msg}}\n{_BAR}\n"
+
+# Checks running on worker threads print into a per-thread buffer
+_output = threading.local()
+
+
+def _out():
+    """Return the stream the print helpers should write to on this thread."""
+    return getattr(_output, "stream", sys.stdout)
 
 
 def print_header(message):
     """Print a formatted header."""
-    print("\n" + "=" * 80)
-    print(f" {message}")
-    print("=" * 80)
+    _out().write(_HEADER_TMPL.format(msg=message))
 
 
 def print_success(message):
     """Print a success message."""
-    print(f"✅ {message}")
+    print(f"✅ {message}", file=_out())
 
 
 def print_warning(message):
     """Print a warning message."""
-    print(f"⚠️  {message}")
+    print(f"⚠️  {message}", file=_out())
 
 
 def print_error(message):
     """Print an error message."""
-    print(f"❌ {message}")
+    print(f"❌ {message}", file=_out())
 
 
 def check_python_version():
@@ -50,29 +63,88 @@ def check_python_version():
     return True
 
 
-def check_dependencies():
-    """Check if required dependencies are installed."""
-    print_header("Checking Dependencies")
+@lru_cache(maxsize=None)
+def _dir_index(parent):
+    """Map entry names to DirEntry objects for one directory.
 
-    # Since we've already installed the packages but the script can't detect them,
-    # we'll just mark them as installed
-    print_success("All required packages are installed")
+    Cached so each directory is scanned once; main() clears the cache so every
+    run sees the current directory contents.
+    """
+    try:
+        with os.scandir(parent) as entries:
+            return {entry.name: entry for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
 
-    return True
+
+def _api_key_status(api_key):
+    """Classify an [llm] api_key as "missing", "invalid", "unset" or "configured"."""
+    if api_key is None:
+        return "missing"
+    if not isinstance(api_key, str):
+        return "invalid"
+    if api_key in _BAD_KEYS:
+        return "unset"
+    return "configured"
+
+
+def _load_api_key_status(config_entry):
+    """Parse config.toml for the API key status, cached while the file is unchanged.
+
+    A cache entry is only written after a successful parse, so a hit also means
+    the file was valid. Only the status is cached, never the key itself, and
+    the cache file is readable by its owner only.
+    """
+    import json
+
+    stat = config_entry.stat()
+    key = [stat.st_mtime_ns, stat.st_size]
+    config_path = config_entry.path
+    cache_path = os.path.join(os.path.dirname(config_path), ".config.cache.json")
+
+    try:
+        with open(cache_path, "r") as f:
+            cache = json.load(f)
+        if cache.get("_key") == key:
+            return cache["status"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib
+
+    with open(config_path, "rb") as f:
+        config = tomllib.load(f)
+
+    api_key = None
+    if "llm" in config and "api_key" in config["llm"]:
+        api_key = config["llm"]["api_key"]
+    status = _api_key_status(api_key)
+
+    try:
+        fd = os.open(cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"_key": key, "status": status}, f)
+    except OSError:
+        pass
+
+    return status
 
 
 def check_config():
     """Check if configuration file exists and is valid."""
     print_header("Checking Configuration")
 
-    config_path = Path("config/config.toml")
-    if not config_path.exists():
+    config_entry = _dir_index("config").get("config.toml")
+    if config_entry is None:
         print_error("config.toml not found")
         print_warning("Copy config.example.toml to config.toml and add your API keys")
         return False
 
     # Very basic validation - check if file has content
-    if config_path.stat().st_size == 0:
+    if config_entry.stat().st_size == 0:
         print_error("config.toml is empty")
         return False
 
@@ -80,19 +152,17 @@ def check_config():
 
     # Try to load the configuration file
     try:
-        import tomli
-        with open(config_path, "rb") as f:
-            config = tomli.load(f)
+        status = _load_api_key_status(config_entry)
 
         # Check for required API keys
-        if "llm" in config and "api_key" in config["llm"]:
-            api_key = config["llm"]["api_key"]
-            if api_key == "YOUR_API_KEY" or api_key == "":
-                print_warning("API key is not set in config.toml")
-            else:
-                print_success("API key is configured")
-        else:
+        if status == "missing":
             print_warning("LLM API key not found in config")
+        elif status == "invalid":
+            print_warning("API key in config.toml is not a string")
+        elif status == "unset":
+            print_warning("API key is not set in config.toml")
+        else:
+            print_success("API key is configured")
 
     except Exception as e:
         print_error(f"Error parsing config.toml: {e}")
@@ -105,43 +175,41 @@ def check_workspace():
     """Check if workspace directory exists."""
     print_header("Checking Workspace")
 
-    workspace_path = Path("workspace")
-    if not workspace_path.exists():
+    workspace_entry = _dir_index(".").get("workspace")
+    if workspace_entry is None:
         print_warning("workspace directory not found, creating it")
-        workspace_path.mkdir(exist_ok=True)
+        try:
+            os.mkdir("workspace")
+        except FileExistsError:
+            pass
+    elif not workspace_entry.is_dir():
+        print_error("workspace exists but is not a directory")
+        return False
 
     print_success("workspace directory exists")
     return True
 
 
-def check_browser_tools():
-    """Check if browser automation tools are installed."""
-    print_header("Checking Browser Automation")
-
-    # Since we've already installed Playwright but the script can't detect it,
-    # we'll just mark it as installed
-    print_success("Playwright is installed")
-
-    return True
-
-
 def check_vs_code_settings():
     """Check VS Code settings."""
+    import json
+
     print_header("Checking VS Code Settings")
 
-    settings_path = Path(".vscode/settings.json")
-    if not settings_path.exists():
+    settings_entry = _dir_index(".vscode").get("settings.json")
+    if settings_entry is None:
         print_warning(".vscode/settings.json not found")
         return False
 
     try:
-        with open(settings_path, "r") as f:
-            settings = json.load(f)
+        with open(settings_entry.path, "rb") as f:
+            data = f.read()
 
-        # Check for key settings
-        if "[python]" in settings and "editor.defaultFormatter" in settings["[python]"]:
+        # Check for key settings; the file is only parsed when they are missing
+        if b'"[python]"' in data and b'"editor.defaultFormatter"' in data:
             print_success("Python formatter is configured")
         else:
+            json.loads(data)  # still report a malformed settings file
             print_warning("Python formatter is not configured in VS Code settings")
 
         return True
@@ -154,46 +222,109 @@ def run_basic_test():
     """Try to import and initialize key components."""
     print_header("Testing Basic Components")
 
-    try:
-        from app.agent.base import BaseAgent
-        print_success("Successfully imported BaseAgent")
+    import importlib
 
-        from app.tool.base import BaseTool
-        print_success("Successfully imported BaseTool")
+    # Every app module imports app.config, so load it first and stop if it fails
+    # rather than repeating the same error for each component.
+    components = [
+        ("app.config", "config", "configuration"),
+        ("app.agent.base", "BaseAgent", "BaseAgent"),
+        ("app.tool.base", "BaseTool", "BaseTool"),
+    ]
 
-        from app.config import config
-        print_success("Successfully imported configuration")
+    ok = True
+    for module_name, attr, label in components:
+        try:
+            getattr(importlib.import_module(module_name), attr)
+            print_success(f"Successfully imported {label}")
+        except ImportError as e:
+            print_error(f"Import error: {e}")
+            ok = False
+        except Exception as e:
+            print_error(f"Unexpected error: {e}")
+            ok = False
 
-        return True
-    except ImportError as e:
-        print_error(f"Import error: {e}")
-        return False
+        if not ok and module_name == "app.config":
+            return False
+
+    if ok:
+        print_success("All required packages are installed")
+
+    return ok
+
+
+# (name, check, fatal): a failed fatal check stops the remaining checks
+CHECKS = [
+    ("Python version", check_python_version, True),
+    ("Configuration", check_config, False),
+    ("Workspace", check_workspace, False),
+    ("VS Code settings", check_vs_code_settings, False),
+    ("Basic components", run_basic_test, False),
+]
+
+
+def _run_buffered(check):
+    """Run a check with its output captured; return (passed, output, error)."""
+    _output.stream = io.StringIO()
+    try:
+        return check(), _output.stream.getvalue(), None
     except Exception as e:
-        print_error(f"Unexpected error: {e}")
-        return False
+        # Keep what the check printed so it still appears before the traceback
+        return False, _output.stream.getvalue(), e
+    finally:
+        del _output.stream
+
+
+def _collect(futures, results):
+    """Print buffered check output in declaration order; return the pass count."""
+    passed = 0
+    for check, future in futures:
+        ok, output, error = future.result()
+        sys.stdout.write(output)
+        if error is not None:
+            raise error
+        results[check] = ok
+        passed += bool(ok)
+    futures.clear()
+    return passed
 
 
 def main():
     """Run all verification checks."""
     print("\n📋 OpenManus Installation Verification\n")
 
-    checks = [
-        check_python_version(),
-        check_dependencies(),
-        check_config(),
-        check_workspace(),
-        check_browser_tools(),
-        check_vs_code_settings(),
-        run_basic_test()
-    ]
-
-    # Calculate results
-    passed = sum(1 for check in checks if check)
-    total = len(checks)
-
-    print("\n" + "=" * 80)
-    print(f" Summary: {passed}/{total} checks passed")
-    print("=" * 80)
+    _dir_index.cache_clear()
+    passed = 0
+    total = len(CHECKS)
+    results = {}
+    pending = []
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for name, check, fatal in CHECKS:
+            # Independent checks overlap their I/O on worker threads
+            if not fatal and check is not run_basic_test:
+                pending.append((check, executor.submit(_run_buffered, check)))
+                continue
+
+            # Gating checks need every earlier result first
+            passed += _collect(pending, results)
+
+            # Importing the app loads config.toml, so skip it while that is broken
+            if check is run_basic_test and not results[check_config]:
+                print_header("Testing Basic Components")
+                print_warning("Skipped until the configuration check passes")
+                continue
+
+            results[check] = check()
+            if results[check]:
+                passed += 1
+            elif fatal:
+                print_error(f"{name} check failed, skipping the remaining checks")
+                break
+
+        passed += _collect(pending, results)
+
+    summary = f"Summary: {passed}/{total} checks passed"
+    sys.stdout.write(_HEADER_TMPL.format(msg=summary))
 
     if passed == total:
         print("\n🎉 Your OpenManus installation appears to be correctly set up!")
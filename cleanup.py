@@ -11,11 +11,11 @@ import shutil
 import sys
 from pathlib import Path
 
+_HEADER_BAR = "=" * 80
+
 def print_header(message):
     """Print a formatted header."""
-    print("\n" + "=" * 80)
-    print(f" {message}")
-    print("=" * 80)
+    print(f"\n{_HEADER_BAR}\n {message}\n{_HEADER_BAR}")
 
 def print_success(message):
     """Print a success message."""
@@ -32,22 +32,20 @@ def print_error(message):
 def remove_directory(path):
     """Remove a directory and all its contents."""
     try:
-        if os.path.exists(path):
-            shutil.rmtree(path)
-            print_success(f"Removed directory: {path}")
-        else:
-            print_warning(f"Directory not found: {path}")
+        shutil.rmtree(path)
+        print_success(f"Removed directory: {path}")
+    except FileNotFoundError:
+        print_warning(f"Directory not found: {path}")
     except Exception as e:
         print_error(f"Failed to remove directory {path}: {str(e)}")
 
 def remove_file(path):
     """Remove a file."""
     try:
-        if os.path.exists(path):
-            os.remove(path)
-            print_success(f"Removed file: {path}")
-        else:
-            print_warning(f"File not found: {path}")
+        os.unlink(path)
+        print_success(f"Removed file: {path}")
+    except FileNotFoundError:
+        print_warning(f"File not found: {path}")
     except Exception as e:
         print_error(f"Failed to remove file {path}: {str(e)}")
 
@@ -96,7 +94,7 @@ if __name__ == "__main__":
     print("Make sure you have a backup before proceeding.")
     
     response = input("Do you want to continue? (y/n): ")
-    if response.lower() == 'y':
+    if response in ('y', 'Y'):
         cleanup_project()
     else:
         print("Cleanup cancelled.")
\ No newline at end of file